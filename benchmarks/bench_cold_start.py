@@ -0,0 +1,104 @@
+"""
+Cold start benchmark for short lived invocations, which are billed by duration.
+Every case is a fresh interpreter, timed from spawn to exit, so it includes interpreter start up and imports.
+Network is not touched: the work path case stubs the HTTP call, so it pays for the lazy imports (aiohttp, numpy),
+the claim, the batch transform and the DB writes but not the API latency.
+
+    python benchmarks/bench_cold_start.py --runs 20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import aiosqlite  # noqa: E402
+
+from src.poke_db import PokeDB  # noqa: E402
+
+# runs oneshot.main with PokeAPI.get_pokemon replaced by a canned response, aiohttp is still imported and a
+# ClientSession created, as in a real invocation
+STUBBED_ONESHOT = """
+import sys
+
+import oneshot
+from src.poke_api import PokeAPI
+
+
+async def get_pokemon(self, poke_id, retry=1):
+    return {"id": poke_id, "name": f"pokemon-{poke_id}", "height": 7, "weight": 69}
+
+PokeAPI.get_pokemon = get_pokemon
+oneshot.main(sys.argv[1:])
+"""
+
+
+async def prepare_db(db_path, done_ids=()):
+    """
+    Creates the schema through PokeDB and marks done_ids DONE
+    """
+    async with aiosqlite.connect(db_path) as conn:
+        db = PokeDB(db_path=db_path, conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await conn.executemany("INSERT OR IGNORE INTO pokemon_data (id, status) VALUES (?, 'DONE')",
+                               [(i,) for i in done_ids])
+        await conn.commit()
+
+
+def time_command(cmd, runs, setup=None):
+    """
+    :param setup: called before each run, not timed
+    :return: wall times in milliseconds of each run
+    """
+    times = []
+    for _ in range(runs):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        subprocess.run(cmd, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--batch", type=int, default=20, help="IDs processed by the work path case")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        done_db = os.path.join(tmp, "done.db")
+        asyncio.run(prepare_db(done_db, range(1, args.batch + 1)))
+
+        # schema only, copied fresh before each run so every run has the whole range to process
+        empty_db = os.path.join(tmp, "empty.db")
+        work_db = os.path.join(tmp, "work.db")
+        asyncio.run(prepare_db(empty_db))
+
+        id_range = ["--start", "1", "--end", str(args.batch)]
+        cases = {
+            "interpreter only": ([sys.executable, "-c", "pass"], None),
+            "import main.py": ([sys.executable, "-c", "import main"], None),
+            "oneshot --help": ([sys.executable, "oneshot.py", "--help"], None),
+            "oneshot, range already done": ([sys.executable, "oneshot.py", *id_range, "--db", done_db], None),
+            f"oneshot, {args.batch} IDs stubbed HTTP": ([sys.executable, "-c", STUBBED_ONESHOT, *id_range,
+                                                         "--db", work_db],
+                                                        lambda: shutil.copyfile(empty_db, work_db)),
+        }
+
+        print(f"{'case':<34}{'median ms':>12}{'min ms':>10}{'max ms':>10}")
+        for name, (cmd, setup) in cases.items():
+            times = time_command(cmd, args.runs, setup)
+            print(f"{name:<34}{statistics.median(times):>12.1f}{min(times):>10.1f}{max(times):>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,14 @@
 #!/usr/local/bin/python
 
 import logging
+import signal
 
 import aiohttp
 
-from src.config import BASE_API_URL, DB_PATH
+from src.config import BASE_API_URL, DB_PATH, PROFILE_ENABLED, PROFILE_DUMP_PATH, PROFILE_SLOW_CALLBACK, PROFILE_DEBUG
 from src.poke_api import PokeAPI
 from src.poke_db import *
+from src.poke_profiler import PokeProfiler
 from src.poke_queue import PokeQueue
 from src.poke_queue_processor import PokeQueueProcessor
 from src.poke_transformer import PokeTransformer
@@ -24,7 +26,7 @@ receiver_semaphore = asyncio.Semaphore(max_receivers)
 
 
 
-async def poke_transform(poke_q: PokeQueue, poke_client, db, retry=False, sleep_time=3, logger=None):
+async def poke_transform(poke_q: PokeQueue, poke_client, db, retry=False, sleep_time=3, logger=None, profiler=None):
     """
     :param poke_q:
     :param poke_client:
@@ -32,54 +34,58 @@ async def poke_transform(poke_q: PokeQueue, poke_client, db, retry=False, sleep_
     :param retry:
     :param sleep_time:
     :param logger:
+    :param profiler:
     :return:
     """
     if retry:
         logger.info("########## Retrying failed requests ###########")
-    poke_t = PokeTransformer(poke_client, poke_q, db, retry, logger)
+    poke_t = PokeTransformer(poke_client, poke_q, db, retry, logger, profiler)
     while True:
         logger.info("Fetching New Pokemon data")
         await poke_t.get_pokemon_info()
         await asyncio.sleep(sleep_time)
 
 
-async def transformers(poke_q: PokeQueue, poke_client, db, retry=False, logger=None):
+async def transformers(poke_q: PokeQueue, poke_client, db, retry=False, logger=None, profiler=None):
     """
     :param poke_q:
     :param poke_client:
     :param db:
     :param retry:
     :param logger:
+    :param profiler:
     :return:
     """
     async with transformer_semaphore:
-        await poke_transform(poke_q, poke_client, db, retry, sleep_time=5, logger=logger)
+        await poke_transform(poke_q, poke_client, db, retry, sleep_time=5, logger=logger, profiler=profiler)
 
 
-async def retry_transformer(poke_q: PokeQueue, poke_client, db, retry=False, logger=None):
+async def retry_transformer(poke_q: PokeQueue, poke_client, db, retry=False, logger=None, profiler=None):
     """
     :param poke_q:
     :param poke_client:
     :param db:
     :param retry:
     :param logger:
+    :param profiler:
     :return:
     """
     async with retry_transformer_semaphore:
-        await poke_transform(poke_q, poke_client, db, retry, sleep_time=30, logger=logger)
+        await poke_transform(poke_q, poke_client, db, retry, sleep_time=30, logger=logger, profiler=profiler)
 
 
-async def receivers(poke_q, worker_id, db, logger):
+async def receivers(poke_q, worker_id, db, logger, profiler=None):
     """
     Added queue consumer logic here along with producers
     :param poke_q:
     :param worker_id:
     :param db:
     :param logger:
+    :param profiler:
     :return:
     """
     async with receiver_semaphore:
-        handler = PokeQueueProcessor(poke_q, worker_id, db, logger)
+        handler = PokeQueueProcessor(poke_q, worker_id, db, logger, profiler)
         await handler.process_queue()
 
 
@@ -89,22 +95,33 @@ async def main():
 
     logger = logging.getLogger()
 
+    profiler = PokeProfiler(logger, enabled=PROFILE_ENABLED, slow_callback=PROFILE_SLOW_CALLBACK)
+    if PROFILE_ENABLED:
+        profiler.start(debug_loop=PROFILE_DEBUG)
+        # dump the sampled profile on demand with `kill -USR1 <pid>`
+        asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, profiler.dump_profile, PROFILE_DUMP_PATH)
+
     async with aiosqlite.connect(DB_PATH) as conn:
         db = PokeDB(db_path=DB_PATH, logger=logger, conn=conn)
         await db.init_db()
 
         shared_queue = PokeQueue(logger)
         async with aiohttp.ClientSession() as session:
-            poke_api = PokeAPI(BASE_API_URL, client=session, logger=logger)
-
-            await asyncio.gather(
-                transformers(shared_queue, poke_api, db, logger=logger),
-                transformers(shared_queue, poke_api, db, logger=logger),
-                retry_transformer(shared_queue, poke_api, db, retry=True, logger=logger),
-                receivers(shared_queue, worker_id=1, db=db, logger=logger),
-                receivers(shared_queue, worker_id=2, db=db, logger=logger),
-                receivers(shared_queue, worker_id=3, db=db, logger=logger)
-            )
+            poke_api = PokeAPI(BASE_API_URL, client=session, logger=logger, profiler=profiler)
+
+            try:
+                await asyncio.gather(
+                    transformers(shared_queue, poke_api, db, logger=logger, profiler=profiler),
+                    transformers(shared_queue, poke_api, db, logger=logger, profiler=profiler),
+                    retry_transformer(shared_queue, poke_api, db, retry=True, logger=logger, profiler=profiler),
+                    receivers(shared_queue, worker_id=1, db=db, logger=logger, profiler=profiler),
+                    receivers(shared_queue, worker_id=2, db=db, logger=logger, profiler=profiler),
+                    receivers(shared_queue, worker_id=3, db=db, logger=logger, profiler=profiler)
+                )
+            finally:
+                profiler.stop()
+                if PROFILE_ENABLED:
+                    profiler.dump_profile(PROFILE_DUMP_PATH)
 
 
 if __name__ == '__main__':
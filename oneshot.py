@@ -0,0 +1,95 @@
+#!/usr/local/bin/python
+"""
+One-shot entry point for cron or event triggered runs, e.g. a Lambda receiving a start and end ID.
+Processes the given ID range once and exits, IDs stuck in START from an earlier run are retried.
+Heavy modules (aiohttp, aiosqlite, numpy through the transform stages) are imported only when there is work to do,
+and the schema DDL is skipped when the table already exists.
+
+    python oneshot.py --start 1 --end 20
+"""
+import argparse
+import asyncio
+import logging
+
+from src.config import BASE_API_URL, DB_PATH
+
+max_fetchers = 5  # Limit concurrent hits to the 3rd party API
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fetch, transform and store a range of Pokemon IDs, then exit")
+    parser.add_argument("--start", type=int, required=True, help="first Pokemon ID to process")
+    parser.add_argument("--end", type=int, required=True, help="last Pokemon ID to process, inclusive")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite DB path")
+    return parser.parse_args(argv)
+
+
+async def run(start: int, end: int, db_path=DB_PATH, logger=None) -> int:
+    """
+    Claims the IDs in [start, end] not tracked yet or stuck, fetches and transforms them and marks them DONE
+    :param start:
+    :param end:
+    :param db_path:
+    :param logger:
+    :return: number of IDs processed
+    :raises aiosqlite.Error: if the range can't be claimed, e.g. the DB is locked, so the scheduler retries the run
+    """
+    import aiosqlite
+
+    from src.poke_db import PokeDB
+
+    async with aiosqlite.connect(db_path) as conn:
+        db = PokeDB(db_path=db_path, logger=logger, conn=conn)
+        await db.ensure_schema()
+
+        poke_ids = await db.claim_poke_ids(start, end)
+        if not poke_ids:
+            logger.info("Nothing to process for IDs %s-%s", start, end)
+            return 0
+
+        import aiohttp
+
+        from src.poke_api import PokeAPI
+        from src.poke_queue import PokeQueue
+        from src.poke_transformer import PokeTransformer
+
+        poke_q = PokeQueue(logger)
+        fetch_semaphore = asyncio.Semaphore(max_fetchers)
+        async with aiohttp.ClientSession() as session:
+            poke_api = PokeAPI(BASE_API_URL, client=session, logger=logger)
+            poke_t = PokeTransformer(poke_api, poke_q, db, retry=False, logger=logger)
+
+            async def fetch(poke_id):
+                async with fetch_semaphore:
+                    try:
+                        return await poke_api.get_pokemon(poke_id)
+                    except Exception as e:
+                        logger.error(e)
+                        return {}
+
+            pokemons = await asyncio.gather(*(fetch(poke_id) for poke_id in poke_ids))
+
+        # the whole range is transformed in one pipeline run, empty records are failed or missing (404) IDs
+        try:
+            await poke_t.process_batch([pokemon for pokemon in pokemons if pokemon])
+        except Exception as e:
+            logger.error(e)
+
+        # single worker on a single connection, no contention so the backoff is skipped
+        processed = 0
+        while (data := await poke_q.receive()) is not None:
+            if await db.update_pokemon(data, 'DONE', backoff=False):
+                processed += 1
+        # IDs which failed stay in START and are claimed again by a later run once stuck, up to MAX_RETRIES times
+        logger.info("Processed %s of %s IDs", processed, len(poke_ids))
+        return processed
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(format="%(filename)s: %(message)s", level=logging.INFO)
+    asyncio.run(run(args.start, args.end, args.db, logger=logging.getLogger()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,18 @@
 """This can be a shared config in AWS Secret Manager or Hashicorp vault, in an actual project
 I WILL NOT COMMIT THE CONFIG, but doing so for convenience in this case"""
+import os
 
 BASE_API_URL = "https://pokeapi.co/api/v2/pokemon/"
 API_KEY = "<KEY>" # dummy API key config, not required for this API
-DB_PATH = "poke_data.db"
\ No newline at end of file
+DB_PATH = "poke_data.db"
+
+# opt-in profiling, enable briefly with POKE_PROFILE=1 and send SIGUSR1 to dump the sampled profile
+PROFILE_ENABLED = os.getenv("POKE_PROFILE", "0") == "1"
+PROFILE_DUMP_PATH = os.getenv("POKE_PROFILE_DUMP", "poke_profile.txt")
+PROFILE_SLOW_CALLBACK = float(os.getenv("POKE_PROFILE_SLOW_CALLBACK", "0.1"))  # seconds
+# asyncio debug mode, logs which callback was slow, expensive so only for short sessions
+PROFILE_DEBUG = os.getenv("POKE_PROFILE_DEBUG", "0") == "1"
+
+# transform stages applied to every fetched record, see src/poke_transform_stages.py for the registered stages
+# e.g. ["base", "units", "imperial", "bmi", "types", "stats"]
+TRANSFORM_STAGES = ["base", "units"]
\ No newline at end of file
@@ -3,17 +3,21 @@ Hits Pokemon API - https://pokeapi.co/api/v2/pokemon/1 from https://pokeapi.co/d
 """
 import asyncio
 
+from .poke_profiler import PokeProfiler
+
 
 class PokeAPI:
-    def __init__(self, base_url, client=None, logger=None):
+    def __init__(self, base_url, client=None, logger=None, profiler=None):
         """
         :param base_url:
         :param client:
         :param logger:
+        :param profiler: optional PokeProfiler, times JSON parsing as the parse stage
         """
         self.base_url = base_url
         self.client = client
         self.logger = logger
+        self.profiler = profiler or PokeProfiler()
 
     async def get_pokemon(self, poke_id: int, retry=1) -> dict:
         """
@@ -30,7 +34,8 @@ class PokeAPI:
                 print(response.status)
                 if response.status == 200:
                     self.logger.info("Successfully fetched data for ID %s", poke_id)
-                    return await response.json()
+                    with self.profiler.stage("parse"):
+                        return await response.json()
                 elif response.status == 404:
                     self.logger.warning("No Pokemon found for ID %s", poke_id)
                     return {}
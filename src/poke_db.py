@@ -12,6 +12,16 @@ import aiosqlite
 
 from .config import DB_PATH
 
+STUCK_AFTER = timedelta(minutes=1)  # START rows older than this are considered stuck and retried
+MAX_RETRIES = 3
+
+
+def stuck_threshold() -> str:
+    """
+    :return: created timestamp before which a START row is stuck, in the format SQLite stores CURRENT_TIMESTAMP
+    """
+    return (datetime.now(UTC) - STUCK_AFTER).strftime('%Y-%m-%d %H:%M:%S')
+
 
 class PokeDB:
     def __init__(self, db_path=DB_PATH, conn=None, logger=None):
@@ -44,6 +54,24 @@ class PokeDB:
         self.logger.info("Database initialized.")
         await self.conn.commit()
 
+    async def schema_exists(self) -> bool:
+        """
+        Checks sqlite_master for the table, a read only query so no write lock is taken
+        :return:
+        """
+        cursor = await self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pokemon_data'")
+        return await cursor.fetchone() is not None
+
+    async def ensure_schema(self):
+        """
+        Runs the DDL in init_db only if the table is missing, avoids the DDL and commit on every short run
+        :return:
+        """
+        if await self.schema_exists():
+            return
+        await self.init_db()
+
     async def get_next_poke_id(self):
         """
         get the max id from DB and insert new IDs to track data already in queue/to be pushed to queue
@@ -65,6 +93,45 @@ class PokeDB:
             await asyncio.sleep(randint(1, 10))  # Random backoff to prevent contention
             return await self.get_next_poke_id()
 
+    async def claim_poke_ids(self, start: int, end: int) -> list:
+        """
+        Claims the IDs in [start, end] in a single transaction, same as get_next_poke_id but for a range.
+        New IDs are inserted in START state, stuck IDs (same rule as get_stuck_poke_id) get their retry_count
+        bumped and created reset, so they are in progress again, and are claimed again.
+        IDs which are DONE, FAILED or in progress in another run are skipped.
+        :param start:
+        :param end:
+        :return: claimed IDs, sorted
+        :raises aiosqlite.Error: e.g. database is locked, so a run which couldn't claim fails instead of looking done
+        """
+        try:
+            # take the write lock up front so another run can't claim the same IDs between the read and the writes
+            await self.conn.execute("BEGIN IMMEDIATE")
+            cursor = await self.conn.execute("""
+                SELECT id, status = 'START' AND created < ? AND retry_count < ?
+                FROM pokemon_data
+                WHERE id BETWEEN ? AND ?
+            """, (stuck_threshold(), MAX_RETRIES, start, end))
+            tracked = dict(await cursor.fetchall())
+            new_ids = [poke_id for poke_id in range(start, end + 1) if poke_id not in tracked]
+            stuck_ids = [poke_id for poke_id, stuck in tracked.items() if stuck]
+
+            await self.conn.executemany("INSERT INTO pokemon_data (id, status) VALUES (?, 'START')",
+                                        [(poke_id,) for poke_id in new_ids])
+            await self.conn.executemany("""
+                UPDATE pokemon_data
+                SET retry_count = retry_count + 1, created = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, [(poke_id,) for poke_id in stuck_ids])
+            await self.conn.commit()
+            if stuck_ids:
+                self.logger.info("Retrying stuck Poke IDs %s", stuck_ids)
+            return sorted(new_ids + stuck_ids)
+        except aiosqlite.Error as e:
+            self.logger.error(e)
+            await self.conn.rollback()
+            raise
+
     async def get_stuck_poke_id(self):
         """
              Fetches the ID of a Pokemon which is stuck(STARTED for longer than specified time
@@ -74,11 +141,11 @@ class PokeDB:
              TODO: ideally we can have a separate queue for retries with different concurrency
              """
         try:
-            threshold_time = (datetime.now(UTC) - timedelta(minutes=1)).strftime('%Y-%m-%d %H:%M:%S')
+            threshold_time = stuck_threshold()
             # async with aiosqlite.connect("poke_data.db",timeout=10) as conn:
             cursor = await self.conn.execute(
-                "SELECT id,retry_count FROM pokemon_data where status = 'START' and created < ? and retry_count < 3 ",
-                (threshold_time,))
+                "SELECT id,retry_count FROM pokemon_data where status = 'START' and created < ? and retry_count < ? ",
+                (threshold_time, MAX_RETRIES))
             stuck_id_tuple = await cursor.fetchone()
             stuck_id = stuck_id_tuple[0] if stuck_id_tuple else 0
             if stuck_id:
@@ -97,10 +164,12 @@ class PokeDB:
             self.logger.error(e)
             await asyncio.sleep(randint(1, 10))  # Random backoff to prevent contention
 
-    async def update_pokemon(self, updated_pokemon: dict, status:str):
+    async def update_pokemon(self, updated_pokemon: dict, status:str, backoff=True):
         """
        Updates the record status on receive to DONE
        :param updated_pokemon: updated information of the Pokemon
+       :param backoff: sleep after the commit to spread writes of concurrent workers, not needed for a single worker
+       :return: True if the record was updated
                """
         # async with aiosqlite.connect("poke_data.db",) as conn:
         try:
@@ -111,8 +180,11 @@ class PokeDB:
             """, (updated_pokemon['name'], updated_pokemon['height'], updated_pokemon['weight'], status, updated_pokemon['id']))
 
             await self.conn.commit()
-            await asyncio.sleep(randint(1, 10))  # Random backoff to prevent contention
+            if backoff:
+                await asyncio.sleep(randint(1, 10))  # Random backoff to prevent contention
 
             self.logger.info(f"Pokémon ID {updated_pokemon['id']} updated to DONE.")
+            return True
         except aiosqlite.Error as e:
             self.logger.error(e)
+            return False
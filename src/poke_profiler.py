@@ -0,0 +1,194 @@
+"""
+Opt-in profiling hooks for the pipeline.
+Measures event loop lag, time spent per pipeline stage (fetch, parse, transform, enqueue, dequeue, persist),
+flags callbacks that block the loop and keeps a sampled profile of the loop thread that can be dumped on demand.
+Everything is a no-op when disabled, so the hooks can stay in the code path permanently.
+"""
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class StageStats:
+    """
+    Running totals for a single pipeline stage
+    """
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    @property
+    def avg(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+class PokeProfiler:
+    def __init__(self, logger=None, enabled=False, lag_interval=0.5, slow_callback=0.1, sample_interval=0.01,
+                 max_stack_depth=32):
+        """
+        Initializes the profiler.
+        :param logger: Logger for reporting lag, slow callbacks and stats.
+        :param enabled: When False every hook is a no-op.
+        :param lag_interval: How often (seconds) the lag monitor wakes up to measure event loop lag.
+        :param slow_callback: Lag/callback duration (seconds) above which the loop is flagged as blocked.
+        :param sample_interval: How often (seconds) the sampler thread captures the loop thread stack.
+        :param max_stack_depth: Frames kept per sampled stack.
+        """
+        self.logger = logger
+        self.enabled = enabled
+        self.lag_interval = lag_interval
+        self.slow_callback = slow_callback
+        self.sample_interval = sample_interval
+        self.max_stack_depth = max_stack_depth
+
+        self.stages = {}
+        self.lag = StageStats()
+        self.slow_callbacks = 0
+        self.samples = Counter()
+        self._samples_lock = threading.Lock()
+
+        self._lag_task = None
+        self._sampler = None
+        self._sampling = threading.Event()
+        self._loop_thread_id = None
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Times a block of pipeline work under the given stage name.
+        Works around awaits too, so the time includes any waiting done by the stage.
+        :param name: stage name, e.g. fetch, transform, persist
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            stats = self.stages.get(name)
+            if stats is None:
+                stats = self.stages[name] = StageStats()
+            stats.add(elapsed)
+
+    async def monitor_lag(self):
+        """
+        Sleeps for lag_interval and measures how late the loop wakes it up.
+        Lag above slow_callback means some callback held the loop, which is flagged as a slow callback.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.lag.add(lag)
+            if lag > self.slow_callback:
+                self.slow_callbacks += 1
+                self.logger.warning("Event loop blocked for %.3fs (slow callback)", lag)
+
+    def _sample(self):
+        """
+        Sampler thread body, records the collapsed stack of the loop thread every sample_interval
+        """
+        while not self._sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = []
+            while frame is not None and len(stack) < self.max_stack_depth:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                with self._samples_lock:
+                    self.samples[key] += 1
+
+    def start(self, debug_loop=False):
+        """
+        Starts the lag monitor and the stack sampler on the running loop.
+        :param debug_loop: also turn on asyncio debug mode so asyncio logs each callback slower than slow_callback
+                           by name, the lag monitor alone can't tell which callback blocked the loop.
+                           Debug mode is expensive, keep it for short sessions.
+        """
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        if debug_loop:
+            loop.slow_callback_duration = self.slow_callback
+            loop.set_debug(True)
+        self._lag_task = asyncio.create_task(self.monitor_lag())
+        self._loop_thread_id = threading.get_ident()
+        self._sampling.clear()
+        self._sampler = threading.Thread(target=self._sample, name="poke-profiler", daemon=True)
+        self._sampler.start()
+        self.logger.info("Profiler started.")
+
+    def stop(self):
+        """
+        Stops the lag monitor and the sampler thread, collected stats are kept
+        """
+        if self._lag_task:
+            self._lag_task.cancel()
+            self._lag_task = None
+        if self._sampler:
+            self._sampling.set()
+            self._sampler.join()
+            self._sampler = None
+
+    def report(self) -> dict:
+        """
+        Snapshot of the collected stats
+        :return: dict with per stage count/total/avg/max, lag stats and slow callback count
+        """
+        return {
+            "stages": {name: {"count": s.count, "total": s.total, "avg": s.avg, "max": s.max}
+                       for name, s in self.stages.items()},
+            "lag": {"count": self.lag.count, "avg": self.lag.avg, "max": self.lag.max},
+            "slow_callbacks": self.slow_callbacks,
+        }
+
+    def log_report(self):
+        """
+        Logs the stats snapshot, one line per stage
+        """
+        for name, s in self.stages.items():
+            self.logger.info("Stage %s: count=%s total=%.3fs avg=%.4fs max=%.4fs",
+                             name, s.count, s.total, s.avg, s.max)
+        self.logger.info("Event loop lag: avg=%.4fs max=%.4fs slow callbacks=%s",
+                         self.lag.avg, self.lag.max, self.slow_callbacks)
+
+    def dump_profile(self, path=None, top=20):
+        """
+        Dumps the sampled profile. Logs the hottest stacks and writes all of them in collapsed stack format
+        (one "frame;frame;frame count" per line, usable with flamegraph.pl/speedscope) if a path is given.
+        :param path: file to write the collapsed stacks to
+        :param top: number of stacks to log
+        :return: the top stacks as (stack, count) tuples
+        """
+        self.log_report()
+        # the sampler thread keeps adding stacks, work on a copy
+        with self._samples_lock:
+            samples = self.samples.copy()
+        hottest = samples.most_common(top)
+        total = sum(samples.values())
+        for stack, count in hottest:
+            leaf = stack.rsplit(";", 1)[-1]
+            self.logger.info("%5.1f%% %s", 100 * count / total, leaf)
+        if path:
+            with open(path, "w") as f:
+                for stack, count in samples.items():
+                    f.write(f"{stack} {count}\n")
+            self.logger.info("Sampled profile written to %s", path)
+        return hottest
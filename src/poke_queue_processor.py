@@ -1,18 +1,22 @@
 import asyncio
 import random
 
+from .poke_profiler import PokeProfiler
+
 class PokeQueueProcessor:
-    def __init__(self, queue, worker_id, db, logger=None):
+    def __init__(self, queue, worker_id, db, logger=None, profiler=None):
         """
         Initializes the queue processor.
         :param queue: The queue from which messages are received.
         :param db: Database instance for updating processed data.
         :param logger: Logger for logging actions.
+        :param profiler: optional PokeProfiler, times the dequeue and persist stages.
         """
         self.queue = queue
         self.db = db
         self.worker_id = worker_id
         self.logger = logger
+        self.profiler = profiler or PokeProfiler()
 
     async def process_queue(self, max_interations=None):
         """
@@ -22,11 +26,13 @@ class PokeQueueProcessor:
         """
         iterations = 0
         while max_interations is None or iterations < max_interations:
-            data = await self.queue.receive()
+            with self.profiler.stage("dequeue"):
+                data = await self.queue.receive()
             if data:
                 self.logger.info(f"Worker {self.worker_id} processing data: {data}")
                 await asyncio.sleep(random.randint(1, 5))  # Processing
-                await self.db.update_pokemon(data, 'DONE')
+                with self.profiler.stage("persist"):
+                    await self.db.update_pokemon(data, 'DONE')
                 self.logger.info(f"Worker {self.worker_id} completed processing for ID {data['id']}")
             else:
                 self.logger.info(f"Worker {self.worker_id} queue empty, awaiting new messages.")
@@ -0,0 +1,207 @@
+"""
+Pluggable transform stages applied to batches of raw Pokemon records from the API.
+Each stage adds derived columns to a batch, numeric columns are NumPy arrays so the cost of adding a field is one
+vectorized operation per batch rather than Python work per record. Rows are only built once, at the end of the pipeline.
+New stages are added by subclassing TransformStage and registering it with @register_stage("name").
+"""
+import inspect
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+from .config import TRANSFORM_STAGES
+
+# order of the base stats in the PokeAPI response
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+
+# columns PokeDB.update_pokemon reads from every transformed record
+REQUIRED_COLUMNS = ("name", "id", "height", "weight")
+
+_STAGES = {}
+
+
+def register_stage(name: str):
+    """
+    Class decorator to register a transform stage under a name usable in TRANSFORM_STAGES
+    :param name:
+    :return:
+    """
+    def wrapper(cls):
+        if inspect.isabstract(cls):
+            raise TypeError(f"Transform stage {name} does not implement transform()")
+        if name in _STAGES:
+            raise ValueError(f"Transform stage {name} is already registered")
+        cls.name = name
+        _STAGES[name] = cls
+        return cls
+    return wrapper
+
+
+def get_stage(name: str):
+    """
+    :param name: registered stage name
+    :return: a new instance of the stage
+    """
+    try:
+        return _STAGES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown transform stage {name}") from None
+
+
+class PokeBatch:
+    """
+    A batch of raw records and the columns derived from them so far
+    """
+    def __init__(self, records: list):
+        self.records = records
+        self.columns = {}
+        self._raw = {}
+
+    def __len__(self):
+        return len(self.records)
+
+    def raw(self, key: str) -> np.ndarray:
+        """
+        Numeric field of the raw records as a float array, extracted once per batch and shared by all stages
+        :param key: field in the raw record, e.g. height
+        :return:
+        """
+        if key not in self._raw:
+            self._raw[key] = np.fromiter((r[key] for r in self.records), dtype=np.float64, count=len(self.records))
+        return self._raw[key]
+
+    def rows(self) -> list:
+        """
+        Builds one dict per record from the columns, arrays are converted to plain Python values
+        """
+        columns = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in self.columns.items()}
+        for key, values in columns.items():
+            if len(values) != len(self.records):
+                raise ValueError(f"Column {key} has {len(values)} values for {len(self.records)} records")
+        keys = list(columns)
+        return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+class TransformStage(ABC):
+    """
+    Base class for transform stages, transform() adds the columns listed in columns to batch.columns in place
+    """
+    name = None
+    columns = ()
+
+    @abstractmethod
+    def transform(self, batch: PokeBatch) -> None:
+        ...
+
+
+@register_stage("base")
+class BaseFieldsStage(TransformStage):
+    """
+    Identity fields, name and id
+    """
+    columns = ("name", "id")
+
+    def transform(self, batch: PokeBatch) -> None:
+        batch.columns["name"] = [r["name"] for r in batch.records]
+        batch.columns["id"] = [r["id"] for r in batch.records]
+
+
+@register_stage("units")
+class UnitsStage(TransformStage):
+    """
+    API height is in decimetres and weight in hectograms, converts them to metres and kilograms
+    """
+    columns = ("height", "weight")
+
+    def transform(self, batch: PokeBatch) -> None:
+        batch.columns["height"] = batch.raw("height") / 10
+        batch.columns["weight"] = batch.raw("weight") / 10
+
+
+@register_stage("imperial")
+class ImperialUnitsStage(TransformStage):
+    """
+    Height in feet and weight in pounds
+    """
+    columns = ("height_ft", "weight_lb")
+
+    def transform(self, batch: PokeBatch) -> None:
+        batch.columns["height_ft"] = batch.raw("height") * (0.1 / 0.3048)
+        batch.columns["weight_lb"] = batch.raw("weight") * (0.1 / 0.45359237)
+
+
+@register_stage("bmi")
+class BMIStage(TransformStage):
+    """
+    Body mass index, kg / m^2. Records with no height get 0
+    """
+    columns = ("bmi",)
+
+    def transform(self, batch: PokeBatch) -> None:
+        height = batch.raw("height") / 10
+        weight = batch.raw("weight") / 10
+        squared = height * height
+        batch.columns["bmi"] = np.divide(weight, squared, out=np.zeros_like(weight), where=squared > 0)
+
+
+@register_stage("types")
+class TypesStage(TransformStage):
+    """
+    Type names ordered by slot, e.g. ['grass', 'poison']
+    """
+    columns = ("types",)
+
+    def transform(self, batch: PokeBatch) -> None:
+        batch.columns["types"] = [[t["type"]["name"] for t in sorted(r.get("types", []), key=lambda t: t["slot"])]
+                                  for r in batch.records]
+
+
+@register_stage("stats")
+class StatsStage(TransformStage):
+    """
+    Base stats per stat name plus total and average, missing stats count as 0
+    """
+    columns = tuple(name.replace("-", "_") for name in STAT_NAMES) + ("base_stat_total", "base_stat_avg")
+
+    def transform(self, batch: PokeBatch) -> None:
+        index = {name: i for i, name in enumerate(STAT_NAMES)}
+        stats = np.zeros((len(batch), len(STAT_NAMES)))
+        for row, record in enumerate(batch.records):
+            for stat in record.get("stats", []):
+                col = index.get(stat["stat"]["name"])
+                if col is not None:
+                    stats[row, col] = stat["base_stat"]
+
+        for col, name in enumerate(STAT_NAMES):
+            batch.columns[name.replace("-", "_")] = stats[:, col]
+        batch.columns["base_stat_total"] = stats.sum(axis=1)
+        batch.columns["base_stat_avg"] = stats.mean(axis=1)
+
+
+class PokeTransformPipeline:
+    def __init__(self, stages=None):
+        """
+        :param stages: stage names or TransformStage instances, applied in order. Defaults to TRANSFORM_STAGES
+        :raises ValueError: if the stages don't produce the REQUIRED_COLUMNS, so a bad config fails at startup
+                            instead of in the queue receivers
+        """
+        stages = TRANSFORM_STAGES if stages is None else stages
+        self.stages = [get_stage(s) if isinstance(s, str) else s for s in stages]
+
+        produced = {column for stage in self.stages for column in stage.columns}
+        missing = [column for column in REQUIRED_COLUMNS if column not in produced]
+        if missing:
+            raise ValueError(f"Transform stages {[s.name for s in self.stages]} don't produce {missing}")
+
+    def run(self, records: list) -> list:
+        """
+        Applies every stage to the batch of raw records
+        :param records: raw Pokemon records from the API
+        :return: transformed records, one dict per input record
+        """
+        if not records:
+            return []
+        batch = PokeBatch(records)
+        for stage in self.stages:
+            stage.transform(batch)
+        return batch.rows()
@@ -1,10 +1,12 @@
 from .poke_api import PokeAPI
 # from poke_db import get_next_poke_id, get_stuck_poke_id
+from .poke_profiler import PokeProfiler
 from .poke_queue import PokeQueue
+from .poke_transform_stages import PokeTransformPipeline, REQUIRED_COLUMNS
 
 
 class PokeTransformer:
-    def __init__(self, poke_client: PokeAPI, poke_queue: PokeQueue, db, retry, logger):
+    def __init__(self, poke_client: PokeAPI, poke_queue: PokeQueue, db, retry, logger, profiler=None, transform_pipeline=None):
         """
         Initializes the transformer.
         :param api_client: The API client to fetch data.
@@ -12,6 +14,8 @@ class PokeTransformer:
         :param db: Database instance for managing processed statuses.
         :param semaphore: Semaphore to control concurrency.
         :param logger: Logger for logging actions.
+        :param profiler: optional PokeProfiler, times the fetch, transform and enqueue stages.
+        :param transform_pipeline: PokeTransformPipeline applied to fetched records, defaults to TRANSFORM_STAGES.
         """
         self.poke_client = poke_client
         self.poke_queue = poke_queue
@@ -19,6 +23,8 @@ class PokeTransformer:
         # self.conn = conn
         self.db = db
         self.logger = logger
+        self.profiler = profiler or PokeProfiler()
+        self.transform_pipeline = transform_pipeline or PokeTransformPipeline()
 
     async def get_pokemon_info(self) -> None:
         """
@@ -41,17 +47,39 @@ class PokeTransformer:
                 return
 
             self.logger.info(f"Fetching data for Pokemon ID {poke_id}.")
-            pokemon = await self.poke_client.get_pokemon(poke_id)
-            transformed_pokemon = {'name': pokemon['name'],
-                                   'id': pokemon['id'],
-                                   'height': pokemon['height'] / 10,
-                                   # transform the height and weight to maybe different units too
-                                   'weight': pokemon['weight'] / 10, }
-
-            await self.poke_queue.send(transformed_pokemon)
+            with self.profiler.stage("fetch"):
+                pokemon = await self.poke_client.get_pokemon(poke_id)
+            with self.profiler.stage("transform"):
+                transformed_pokemon = self.transform_pipeline.run([pokemon])[0]
+
+            with self.profiler.stage("enqueue"):
+                await self.poke_queue.send(transformed_pokemon)
         except Exception as e:
             # TODO: push to retry queue on failure
             print("ok")
             self.logger.error(e)
 
+    async def process_batch(self, pokemons: list) -> list:
+        """
+        Transforms already fetched Pokemon records in one pipeline run and enqueues them.
+        Use this over get_pokemon_info when the records are fetched together, the transform is vectorized per batch.
+        Records missing any of the REQUIRED_COLUMNS are logged and skipped so they don't fail the whole batch.
+        :param pokemons: raw records from the API
+        :return: the transformed records sent to the queue
+        """
+        complete = []
+        for pokemon in pokemons:
+            if all(pokemon.get(column) is not None for column in REQUIRED_COLUMNS):
+                complete.append(pokemon)
+            else:
+                self.logger.warning("Skipping incomplete Pokemon record with ID %s", pokemon.get("id"))
+
+        with self.profiler.stage("transform"):
+            transformed = self.transform_pipeline.run(complete)
+
+        with self.profiler.stage("enqueue"):
+            for transformed_pokemon in transformed:
+                await self.poke_queue.send(transformed_pokemon)
+        return transformed
+
 
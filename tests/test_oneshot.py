@@ -0,0 +1,95 @@
+import logging
+from unittest.mock import AsyncMock
+
+import aiosqlite
+import pytest
+
+import oneshot
+from src.poke_api import PokeAPI
+from src.poke_db import PokeDB
+
+POKEMON = {
+    1: {"id": 1, "name": "bulbasaur", "height": 7, "weight": 69},
+    2: {"id": 2, "name": "ivysaur", "height": 10, "weight": 130},
+}
+
+
+async def fetch_rows(db_path):
+    """Helper function to read back the tracked rows"""
+    async with aiosqlite.connect(db_path) as conn:
+        cursor = await conn.execute("SELECT id, name, height, weight, status, retry_count FROM pokemon_data ORDER BY id")
+        return await cursor.fetchall()
+
+
+def test_parse_args():
+    """Test the ID range and DB path are parsed"""
+    args = oneshot.parse_args(["--start", "1", "--end", "10", "--db", "test.db"])
+
+    assert (args.start, args.end, args.db) == (1, 10, "test.db")
+
+
+@pytest.mark.asyncio
+async def test_run_nothing_to_process(tmp_path):
+    """Test a range which is already tracked exits without fetching"""
+    db_path = str(tmp_path / "poke.db")
+    async with aiosqlite.connect(db_path) as conn:
+        db = PokeDB(db_path=db_path, conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await db.claim_poke_ids(1, 3)
+
+    processed = await oneshot.run(1, 3, db_path, logger=logging.getLogger())
+
+    assert processed == 0
+
+
+@pytest.mark.asyncio
+async def test_run_processes_range(tmp_path, monkeypatch):
+    """Test the range is fetched, transformed and stored, a missing ID stays in START"""
+    # ID 3 is not found (404)
+    get_pokemon = AsyncMock(side_effect=lambda poke_id: POKEMON.get(poke_id, {}))
+    monkeypatch.setattr(PokeAPI, "get_pokemon", get_pokemon)
+    db_path = str(tmp_path / "poke.db")
+
+    processed = await oneshot.run(1, 3, db_path, logger=logging.getLogger())
+
+    assert processed == 2
+    assert get_pokemon.await_count == 3
+    assert await fetch_rows(db_path) == [
+        (1, "bulbasaur", 0.7, 6.9, "DONE", 0),
+        (2, "ivysaur", 1.0, 13.0, "DONE", 0),
+        (3, None, None, None, "START", 0),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_run_retries_stuck_ids(tmp_path, monkeypatch):
+    """Test an ID left in START by a failed run is claimed again by a later run"""
+    get_pokemon = AsyncMock(side_effect=lambda poke_id: POKEMON.get(poke_id, {}))
+    monkeypatch.setattr(PokeAPI, "get_pokemon", get_pokemon)
+    db_path = str(tmp_path / "poke.db")
+    async with aiosqlite.connect(db_path) as conn:
+        db = PokeDB(db_path=db_path, conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await conn.execute("INSERT INTO pokemon_data (id, status, created) VALUES (1, 'START', '2000-01-01')")
+        await conn.execute("INSERT INTO pokemon_data (id, status) VALUES (2, 'START')")  # in progress elsewhere
+        await conn.commit()
+
+    processed = await oneshot.run(1, 2, db_path, logger=logging.getLogger())
+
+    assert processed == 1
+    get_pokemon.assert_awaited_once_with(1)
+    rows = await fetch_rows(db_path)
+    assert rows[0] == (1, "bulbasaur", 0.7, 6.9, "DONE", 1)
+    assert rows[1][4] == "START"
+
+
+@pytest.mark.asyncio
+async def test_run_counts_only_stored(tmp_path, monkeypatch):
+    """Test an ID whose DB update fails is not counted as processed"""
+    monkeypatch.setattr(PokeAPI, "get_pokemon", AsyncMock(side_effect=lambda poke_id: POKEMON[poke_id]))
+    monkeypatch.setattr(PokeDB, "update_pokemon", AsyncMock(side_effect=[True, False]))
+    db_path = str(tmp_path / "poke.db")
+
+    processed = await oneshot.run(1, 2, db_path, logger=logging.getLogger())
+
+    assert processed == 1
@@ -0,0 +1,91 @@
+import logging
+
+import aiosqlite
+import pytest
+
+from src.poke_db import PokeDB
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_creates_table():
+    """Test the schema is created when missing"""
+    async with aiosqlite.connect(":memory:") as conn:
+        db = PokeDB(conn=conn, logger=logging.getLogger())
+
+        assert not await db.schema_exists()
+        await db.ensure_schema()
+        assert await db.schema_exists()
+
+
+@pytest.mark.asyncio
+async def test_ensure_schema_skips_ddl():
+    """Test the DDL is not run again when the table already exists"""
+    async with aiosqlite.connect(":memory:") as conn:
+        db = PokeDB(conn=conn, logger=logging.getLogger())
+        await db.init_db()
+
+        db.init_db = None  # would fail if called
+        await db.ensure_schema()
+
+
+@pytest.mark.asyncio
+async def test_claim_poke_ids():
+    """Test a range is claimed once, IDs already tracked are skipped"""
+    async with aiosqlite.connect(":memory:") as conn:
+        db = PokeDB(conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await conn.execute("INSERT INTO pokemon_data (id, status) VALUES (3, 'DONE')")
+        await conn.commit()
+
+        assert await db.claim_poke_ids(1, 4) == [1, 2, 4]
+        assert await db.claim_poke_ids(1, 4) == []
+
+        cursor = await conn.execute("SELECT id, status FROM pokemon_data ORDER BY id")
+        assert await cursor.fetchall() == [(1, "START"), (2, "START"), (3, "DONE"), (4, "START")]
+
+
+@pytest.mark.asyncio
+async def test_claim_poke_ids_stuck():
+    """Test IDs stuck in START are claimed again until they run out of retries"""
+    async with aiosqlite.connect(":memory:") as conn:
+        db = PokeDB(conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await conn.executemany(
+            "INSERT INTO pokemon_data (id, status, created, retry_count) VALUES (?, 'START', '2000-01-01', ?)",
+            [(1, 0), (2, 3)])
+        await conn.commit()
+
+        assert await db.claim_poke_ids(1, 2) == [1]
+
+        cursor = await conn.execute("SELECT retry_count FROM pokemon_data WHERE id = 1")
+        assert await cursor.fetchone() == (1,)
+
+        # claimed again so it is in progress, not stuck, until the threshold passes again
+        assert await db.claim_poke_ids(1, 2) == []
+
+
+@pytest.mark.asyncio
+async def test_claim_poke_ids_locked(tmp_path):
+    """Test a claim which can't get the write lock raises instead of returning no IDs"""
+    db_path = str(tmp_path / "poke.db")
+    async with aiosqlite.connect(db_path) as holder, aiosqlite.connect(db_path, timeout=0.1) as conn:
+        db = PokeDB(db_path=db_path, conn=conn, logger=logging.getLogger())
+        await db.init_db()
+        await holder.execute("BEGIN IMMEDIATE")
+
+        with pytest.raises(aiosqlite.OperationalError, match="locked"):
+            await db.claim_poke_ids(1, 2)
+
+
+@pytest.mark.asyncio
+async def test_update_pokemon_result():
+    """Test update_pokemon reports whether the record was updated"""
+    async with aiosqlite.connect(":memory:") as conn:
+        db = PokeDB(conn=conn, logger=logging.getLogger())
+        pokemon = {"id": 1, "name": "bulbasaur", "height": 0.7, "weight": 6.9}
+
+        assert not await db.update_pokemon(pokemon, 'DONE', backoff=False)  # no table yet
+
+        await db.init_db()
+        await db.claim_poke_ids(1, 1)
+        assert await db.update_pokemon(pokemon, 'DONE', backoff=False)
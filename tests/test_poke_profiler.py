@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from src.poke_profiler import PokeProfiler
+
+
+@pytest.mark.asyncio
+async def test_stage_disabled():
+    """Test stages are not recorded when profiling is disabled"""
+    profiler = PokeProfiler(logging.getLogger())
+
+    with profiler.stage("fetch"):
+        await asyncio.sleep(0)
+
+    assert profiler.stages == {}
+
+
+@pytest.mark.asyncio
+async def test_stage_timing():
+    """Test stage time is accumulated per stage name"""
+    profiler = PokeProfiler(logging.getLogger(), enabled=True)
+
+    for _ in range(2):
+        with profiler.stage("fetch"):
+            await asyncio.sleep(0.01)
+
+    stats = profiler.report()["stages"]["fetch"]
+    assert stats["count"] == 2
+    assert stats["total"] >= 0.02
+    assert stats["max"] >= 0.01
+
+
+@pytest.mark.asyncio
+async def test_stage_timing_on_error():
+    """Test stage time is recorded even when the stage raises"""
+    profiler = PokeProfiler(logging.getLogger(), enabled=True)
+
+    with pytest.raises(ValueError):
+        with profiler.stage("transform"):
+            raise ValueError("bad data")
+
+    assert profiler.stages["transform"].count == 1
+
+
+@pytest.mark.asyncio
+async def test_slow_callback_flagged():
+    """Test a blocking call on the loop is flagged as a slow callback"""
+    profiler = PokeProfiler(logging.getLogger(), enabled=True, lag_interval=0.01, slow_callback=0.05)
+    profiler.start()
+
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)  # block the event loop
+    await asyncio.sleep(0.05)
+    profiler.stop()
+
+    report = profiler.report()
+    assert report["slow_callbacks"] >= 1
+    assert report["lag"]["max"] >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_debug_loop():
+    """Test asyncio debug mode is only turned on when asked for"""
+    loop = asyncio.get_running_loop()
+    profiler = PokeProfiler(logging.getLogger(), enabled=True, slow_callback=0.05)
+
+    profiler.start()
+    assert not loop.get_debug()
+    profiler.stop()
+
+    profiler.start(debug_loop=True)
+    assert loop.get_debug()
+    assert loop.slow_callback_duration == 0.05
+    profiler.stop()
+    loop.set_debug(False)
+
+
+@pytest.mark.asyncio
+async def test_dump_profile(tmp_path):
+    """Test the sampled profile is dumped in collapsed stack format"""
+    profiler = PokeProfiler(logging.getLogger(), enabled=True, sample_interval=0.001)
+    profiler.start()
+
+    time.sleep(0.05)  # keep the loop thread busy so it gets sampled
+    profiler.stop()
+
+    path = tmp_path / "profile.txt"
+    hottest = profiler.dump_profile(path)
+
+    assert hottest
+    lines = path.read_text().splitlines()
+    assert lines
+    assert any("test_dump_profile" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
@@ -0,0 +1,118 @@
+import pytest
+
+from src import poke_transform_stages
+from src.poke_transform_stages import (PokeTransformPipeline, TransformStage, get_stage, register_stage)
+
+
+def make_pokemon(poke_id, name, height, weight):
+    """Helper function to create a raw API record"""
+    return {
+        "id": poke_id,
+        "name": name,
+        "height": height,
+        "weight": weight,
+        "types": [{"slot": 2, "type": {"name": "poison"}}, {"slot": 1, "type": {"name": "grass"}}],
+        "stats": [{"base_stat": 45, "stat": {"name": "hp"}}, {"base_stat": 49, "stat": {"name": "attack"}},
+                  {"base_stat": 49, "stat": {"name": "defense"}}, {"base_stat": 65, "stat": {"name": "special-attack"}},
+                  {"base_stat": 65, "stat": {"name": "special-defense"}}, {"base_stat": 45, "stat": {"name": "speed"}}],
+    }
+
+
+def test_default_pipeline():
+    """Test the default stages keep the original transformed shape"""
+    pipeline = PokeTransformPipeline()
+
+    result = pipeline.run([make_pokemon(1, "bulbasaur", 7, 69), make_pokemon(4, "charmander", 6, 85)])
+
+    assert result == [
+        {"name": "bulbasaur", "id": 1, "height": 0.7, "weight": 6.9},
+        {"name": "charmander", "id": 4, "height": 0.6, "weight": 8.5},
+    ]
+    assert all(type(r["height"]) is float for r in result)
+
+
+def test_derived_stages():
+    """Test the unit conversion, bmi, types and stats stages"""
+    pipeline = PokeTransformPipeline(["base", "units", "imperial", "bmi", "types", "stats"])
+
+    result = pipeline.run([make_pokemon(1, "bulbasaur", 7, 69)])[0]
+
+    assert result["height_ft"] == pytest.approx(2.2966, abs=1e-4)
+    assert result["weight_lb"] == pytest.approx(15.2119, abs=1e-4)
+    assert result["bmi"] == pytest.approx(6.9 / 0.49)
+    assert result["types"] == ["grass", "poison"]
+    assert result["special_attack"] == 65
+    assert result["base_stat_total"] == 318
+    assert result["base_stat_avg"] == 53
+
+
+def test_bmi_zero_height():
+    """Test a record with no height does not divide by zero"""
+    pipeline = PokeTransformPipeline(["base", "units", "bmi"])
+
+    result = pipeline.run([make_pokemon(1, "missingno", 0, 10)])
+
+    assert result[0]["bmi"] == 0.0
+
+
+def test_empty_batch():
+    """Test an empty batch returns no records"""
+    assert PokeTransformPipeline().run([]) == []
+
+
+def test_register_custom_stage(monkeypatch):
+    """Test a registered stage can be used by name alongside the built-in ones"""
+    monkeypatch.setattr(poke_transform_stages, "_STAGES", dict(poke_transform_stages._STAGES))
+
+    @register_stage("test_double_weight")
+    class DoubleWeightStage(TransformStage):
+        columns = ("double_weight",)
+
+        def transform(self, batch):
+            batch.columns["double_weight"] = batch.raw("weight") * 2
+
+    pipeline = PokeTransformPipeline(["base", "units", "test_double_weight"])
+
+    result = pipeline.run([make_pokemon(1, "bulbasaur", 7, 69)])
+    assert result == [{"name": "bulbasaur", "id": 1, "height": 0.7, "weight": 6.9, "double_weight": 138.0}]
+
+    with pytest.raises(ValueError, match="already registered"):
+        register_stage("test_double_weight")(DoubleWeightStage)
+
+
+def test_unknown_stage():
+    """Test an unknown stage name raises"""
+    with pytest.raises(ValueError, match="Unknown transform stage"):
+        get_stage("does-not-exist")
+
+
+def test_missing_required_columns():
+    """Test stages which don't produce the columns the DB needs fail when the pipeline is built"""
+    with pytest.raises(ValueError, match="height"):
+        PokeTransformPipeline(["base", "types"])
+
+
+def test_register_abstract_stage(monkeypatch):
+    """Test a stage without transform() can't be registered"""
+    monkeypatch.setattr(poke_transform_stages, "_STAGES", dict(poke_transform_stages._STAGES))
+
+    class UnfinishedStage(TransformStage):
+        columns = ("unfinished",)
+
+    with pytest.raises(TypeError, match="does not implement"):
+        register_stage("test_unfinished")(UnfinishedStage)
+    assert "test_unfinished" not in poke_transform_stages._STAGES
+
+
+def test_column_length_mismatch():
+    """Test a stage writing a column of the wrong length fails instead of dropping records"""
+    class ShortColumnStage(TransformStage):
+        columns = ("short",)
+
+        def transform(self, batch):
+            batch.columns["short"] = [1]
+
+    pipeline = PokeTransformPipeline(["base", "units", ShortColumnStage()])
+
+    with pytest.raises(ValueError, match="short"):
+        pipeline.run([make_pokemon(1, "bulbasaur", 7, 69), make_pokemon(4, "charmander", 6, 85)])
@@ -132,4 +132,66 @@ async def test_get_pokemon_info_api_error():
     # Verify interactions
     mock_db.get_next_poke_id.assert_called_once()
     mock_api.get_pokemon.assert_called_once_with(1)
-    mock_queue.send.assert_not_called()
\ No newline at end of file
+    mock_queue.send.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_process_batch():
+    """Test fetched records are transformed in one batch and enqueued"""
+    # Mock dependencies
+    mock_api = MagicMock()
+    mock_queue = MagicMock()
+    mock_db = MagicMock()
+    mock_logger = logging.getLogger()
+
+    # Configure mocks
+    mock_queue.send = AsyncMock()
+
+    # Create transformer instance
+    transformer = PokeTransformer(
+        mock_api, mock_queue, mock_db, retry=False, logger=mock_logger
+    )
+
+    # Execute
+    result = await transformer.process_batch([
+        {"id": 1, "name": "bulbasaur", "height": 7, "weight": 69},
+        {"id": 4, "name": "charmander", "height": 6, "weight": 85},
+    ])
+
+    # Verify interactions
+    expected = [
+        {"name": "bulbasaur", "id": 1, "height": 0.7, "weight": 6.9},
+        {"name": "charmander", "id": 4, "height": 0.6, "weight": 8.5},
+    ]
+    assert result == expected
+    assert mock_queue.send.call_count == 2
+    mock_queue.send.assert_any_call(expected[1])
+
+
+@pytest.mark.asyncio
+async def test_process_batch_skips_incomplete():
+    """Test a record missing a required field is skipped without failing the rest of the batch"""
+    # Mock dependencies
+    mock_api = MagicMock()
+    mock_queue = MagicMock()
+    mock_db = MagicMock()
+    mock_logger = logging.getLogger()
+
+    # Configure mocks
+    mock_queue.send = AsyncMock()
+
+    # Create transformer instance
+    transformer = PokeTransformer(
+        mock_api, mock_queue, mock_db, retry=False, logger=mock_logger
+    )
+
+    # Execute
+    result = await transformer.process_batch([
+        {"id": 1, "name": "bulbasaur", "height": 7, "weight": 69},
+        {"id": 2, "name": "ivysaur", "height": None, "weight": 130},
+        {"id": 3, "name": "venusaur", "weight": 1000},
+    ])
+
+    # Verify interactions
+    assert result == [{"name": "bulbasaur", "id": 1, "height": 0.7, "weight": 6.9}]
+    mock_queue.send.assert_called_once_with(result[0])